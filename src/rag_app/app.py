@@ -6,12 +6,14 @@ warnings.filterwarnings("ignore", message=".*LibreSSL.*")
 
 import os
 from pathlib import Path
+from typing import Optional
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from dotenv import load_dotenv
 
-from .chain import build_retriever_and_chain, answer_query
+from .chain import build_retriever_and_chain, answer_query, check_filters_supported
+from .metadata import MissingMetadataError, parse_filters
 
 load_dotenv()
 
@@ -48,7 +50,7 @@ def startup_event():
         app.state.qa_chain = None
 
 
-def _run_query(q: str):
+def _run_query(q: str, filters: Optional[dict] = None):
     """Shared logic for query endpoint."""
     qa_chain = getattr(app.state, "qa_chain", None)
     if qa_chain is None:
@@ -56,15 +58,40 @@ def _run_query(q: str):
             status_code=503,
             detail="QA chain not initialized. Build the index and set the provider env vars (see .env.example).",
         )
-    return answer_query(qa_chain, q)
+    try:
+        filters = parse_filters(filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if filters is not None:
+        try:
+            check_filters_supported(qa_chain)
+        except MissingMetadataError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+    return answer_query(qa_chain, q, filters=filters)
 
 
 @app.get("/query")
 @app.post("/query")
-async def query(q: str):
+async def query(
+    q: str,
+    source: Optional[str] = None,
+    file_type: Optional[str] = None,
+    modified_after: Optional[str] = None,
+    modified_before: Optional[str] = None,
+):
     """Run the RAG QA chain against the indexed store.
 
     Supports both GET and POST. Ensure you have indexed documents (run the indexer)
     and set the required API keys for your chosen EMBEDDING_PROVIDER / LLM_PROVIDER.
+
+    Optional filters restrict retrieval before scoring: `source` (path or glob),
+    `file_type` (e.g. pdf), `modified_after` / `modified_before` (ISO date or epoch).
+    Comma-separate values to match any of several sources or file types.
     """
-    return _run_query(q)
+    filters = {
+        "source": source,
+        "file_type": file_type,
+        "modified_after": modified_after,
+        "modified_before": modified_before,
+    }
+    return _run_query(q, filters)
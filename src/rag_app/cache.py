@@ -0,0 +1,144 @@
+"""
+Persistent, size-bounded cache for LLM generations. Configure via environment:
+
+  LLM_CACHE           set to 0/false/off to disable (default: on)
+  LLM_CACHE_PATH      SQLite file (default: ./.llm_cache/generations.sqlite3)
+  LLM_CACHE_MAX_MB    size bound; least recently used entries are evicted (default: 256)
+
+Entries are keyed on the fully rendered prompt plus the model identity string, so
+repeated contexts skip the LLM. SQLite (WAL mode) lets API workers and CLI runs
+share one cache file.
+"""
+import hashlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+DEFAULT_CACHE_PATH = "./.llm_cache/generations.sqlite3"
+DEFAULT_MAX_MB = 256
+# Hits refresh an entry's LRU timestamp at most this often (seconds), so reads
+# rarely need SQLite's single write lock.
+DEFAULT_TOUCH_INTERVAL = 60.0
+
+
+def cache_enabled() -> bool:
+    return (os.getenv("LLM_CACHE") or "1").strip().lower() not in {"0", "false", "off", "no"}
+
+
+def _cache_key(prompt: str, llm_string: str) -> str:
+    h = hashlib.sha256()
+    h.update(llm_string.encode("utf-8"))
+    h.update(b"\x00")
+    h.update(prompt.encode("utf-8"))
+    return h.hexdigest()
+
+
+class GenerationCache:
+    """SQLite-backed key/value store for serialized generations with LRU eviction by size."""
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        max_bytes: Optional[int] = None,
+        touch_interval: float = DEFAULT_TOUCH_INTERVAL,
+    ):
+        self.path = Path(path or os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH))
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("LLM_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS generations ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS generations_accessed ON generations (accessed)")
+                # Running total of entry sizes, so eviction never has to scan the table
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache_meta (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)"
+                )
+                conn.execute(
+                    "INSERT OR IGNORE INTO cache_meta (id, total) "
+                    "SELECT 0, COALESCE(SUM(size), 0) FROM generations"
+                )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call: safe across threads and processes.
+        return sqlite3.connect(str(self.path), timeout=30)
+
+    def get(self, prompt: str, llm_string: str) -> Optional[str]:
+        """Return the cached value for (prompt, llm_string), or None."""
+        key = _cache_key(prompt, llm_string)
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value, accessed FROM generations WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] >= self.touch_interval:
+                with conn:
+                    conn.execute("UPDATE generations SET accessed = ? WHERE key = ?", (now, key))
+            return row[0]
+        finally:
+            conn.close()
+
+    def put(self, prompt: str, llm_string: str, value: str) -> None:
+        """Store a value and evict least recently used entries beyond max_bytes."""
+        key = _cache_key(prompt, llm_string)
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        conn = self._connect()
+        try:
+            with conn:
+                # Take the write lock up front so the size bookkeeping is atomic across processes
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT size FROM generations WHERE key = ?", (key,)).fetchone()
+                old_size = row[0] if row else 0
+                conn.execute(
+                    "INSERT OR REPLACE INTO generations (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, size, time.time()),
+                )
+                conn.execute("UPDATE cache_meta SET total = total + ? WHERE id = 0", (size - old_size,))
+                self._evict(conn)
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT total FROM cache_meta WHERE id = 0").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+        doomed = []
+        freed = 0
+        for key, size in conn.execute("SELECT key, size FROM generations ORDER BY accessed ASC"):
+            if freed >= excess:
+                break
+            doomed.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM generations WHERE key = ?", doomed)
+        conn.execute("UPDATE cache_meta SET total = total - ? WHERE id = 0", (freed,))
+
+    def clear(self) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM generations")
+                conn.execute("UPDATE cache_meta SET total = 0 WHERE id = 0")
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+        finally:
+            conn.close()
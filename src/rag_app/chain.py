@@ -3,6 +3,7 @@ from langchain.chains import RetrievalQA
 from langchain.prompts import PromptTemplate
 
 from .vectorstore import VectorStore
+from .metadata import MissingMetadataError
 from .prompts import DEFAULT_QA_PROMPT
 from .providers import get_embedding_client, get_llm
 
@@ -27,8 +28,8 @@ def build_retriever_and_chain(
         (retriever, qa_chain)
     """
     emb = get_embedding_client()
-    vs = VectorStore(embedding_client=emb, persist_dir=persist_dir)
-    retriever = vs.get_retriever(collection_name=collection_name, k=k)
+    vs = VectorStore(embedding_client=emb, persist_dir=persist_dir, collection_name=collection_name)
+    retriever = vs.get_retriever(k=k)
 
     llm = get_llm(model_name=llm_model, temperature=0.0)
     prompt_to_use = prompt or DEFAULT_QA_PROMPT
@@ -44,12 +45,29 @@ def build_retriever_and_chain(
     return retriever, qa_chain
 
 
-def answer_query(qa_chain, query: str) -> Dict:
+def check_filters_supported(qa_chain) -> None:
+    """Raise MissingMetadataError if the chain's collection has no metadata store to filter on.
+
+    Call at the entry point (API/CLI) before running a filtered query.
+    """
+    vs = qa_chain.retriever.vectorstore
+    if vs.metadata_store() is None:
+        raise MissingMetadataError(vs.collection_name)
+
+
+def answer_query(qa_chain, query: str, filters: Optional[Dict] = None) -> Dict:
     """Run the QA chain and return the chain output (answer + sources).
 
+    `filters` restricts retrieval by metadata and is applied before vector
+    scoring; pass the output of rag_app.metadata.parse_filters.
+
     Returns the raw chain output which usually contains 'result'/'answer' and
     'source_documents'.
     """
+    if filters is not None:
+        # Per-query copy so the shared chain/retriever is never mutated
+        retriever = qa_chain.retriever.model_copy(update={"filters": filters})
+        qa_chain = qa_chain.model_copy(update={"retriever": retriever})
     res = qa_chain.invoke({"query": query})
 
     # Normalize the answer text
@@ -8,7 +8,8 @@ import os
 import argparse
 from dotenv import load_dotenv
 
-from .chain import build_retriever_and_chain, answer_query
+from .chain import build_retriever_and_chain, answer_query, check_filters_supported
+from .metadata import MissingMetadataError, parse_filters
 
 load_dotenv()
 
@@ -19,16 +20,34 @@ def main():
     parser.add_argument("--persist-dir", default=os.getenv("CHROMA_PERSIST_DIR", None))
     parser.add_argument("--collection", default="default")
     parser.add_argument("--model", default=None, help="LLM model name (default: from .env per provider, e.g. OLLAMA_LLM_MODEL)")
+    parser.add_argument("--source", default=None, help="Only search these source paths/globs (comma-separated)")
+    parser.add_argument("--file-type", default=None, help="Only search these file types, e.g. pdf,md")
+    parser.add_argument("--modified-after", default=None, help="Only search files modified on/after this date (ISO or epoch)")
+    parser.add_argument("--modified-before", default=None, help="Only search files modified before this date (ISO or epoch)")
     args = parser.parse_args()
+    try:
+        filters = parse_filters({
+            "source": args.source,
+            "file_type": args.file_type,
+            "modified_after": args.modified_after,
+            "modified_before": args.modified_before,
+        })
+    except ValueError as e:
+        parser.error(str(e))
 
     _, qa_chain = build_retriever_and_chain(
         persist_dir=args.persist_dir,
         collection_name=args.collection,
         llm_model=args.model,
     )
+    if filters is not None:
+        try:
+            check_filters_supported(qa_chain)
+        except MissingMetadataError as e:
+            parser.error(str(e))
 
     if args.query:
-        res = answer_query(qa_chain, args.query)
+        res = answer_query(qa_chain, args.query, filters=filters)
         print("Answer:\n", res.get("answer"))
         if res.get("sources"):
             print("\nSources:")
@@ -42,7 +61,7 @@ def main():
         q = input("query> ")
         if not q or q.strip().lower() in {"exit", "quit"}:
             break
-        res = answer_query(qa_chain, q)
+        res = answer_query(qa_chain, q, filters=filters)
         print("Answer:\n", res.get("answer"))
         if res.get("sources"):
             print("\nSources:")
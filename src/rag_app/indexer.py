@@ -13,12 +13,19 @@ from dotenv import load_dotenv
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from .ingest import load_documents
 from .vectorstore import VectorStore
+from .metadata import MetadataStore
 from .preprocess import preprocess, deduplicate_texts
 
 logger = logging.getLogger(__name__)
 
 
-def index_directory(source_dir: str, persist_dir: str = None, chunk_size: int = 1000, chunk_overlap: int = 200):
+def index_directory(
+    source_dir: str,
+    persist_dir: str = None,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    collection_name: str = "default",
+):
     logger.info("Indexing directory: %s", source_dir)
 
     # Load raw documents
@@ -40,33 +47,33 @@ def index_directory(source_dir: str, persist_dir: str = None, chunk_size: int =
     if len(texts) < len(docs):
         logger.info("After deduplication: %d document(s)", len(texts))
 
+    # Chunk metadata is columnar: each source is interned once and chunks are
+    # (source id, chunk index) rows rather than per-chunk dict copies.
+    store = MetadataStore()
     splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
     split_texts = []
-    metadatas = []
+    refs = []
     for d_text, meta in zip(texts, metas):
+        source_id = store.add_source(meta.get("source", ""), modified=meta.get("modified"))
         chunks = splitter.split_text(d_text)
         for i, c in enumerate(chunks):
             split_texts.append(c)
-            m = dict(meta)
-            m.update({"chunk": i})
-            metadatas.append(m)
+            refs.append((source_id, i))
 
     # Deduplicate chunks to reduce near-duplicate segments
-    split_texts, metadatas = deduplicate_texts(split_texts, metadatas)
+    split_texts, refs = deduplicate_texts(split_texts, refs)
+    for source_id, i in refs:
+        store.add_chunk(source_id, i)
     logger.info("Split into %d chunk(s) (chunk_size=%d, overlap=%d)", len(split_texts), chunk_size, chunk_overlap)
 
     # build/store in Chroma using embedding function (Chroma will call it)
     from .providers import get_embedding_client
-    from .vectorstore import _clear_collection_if_exists
 
-    persist_path = persist_dir or os.getenv("CHROMA_PERSIST_DIR", "./.chromadb")
-    _clear_collection_if_exists(persist_path, collection_name="default")
     logger.info("Connecting to embedding provider and creating vector store...")
     emb_client = get_embedding_client()
-    vs = VectorStore(embedding_client=emb_client, persist_dir=persist_dir)
-    docs_to_add = [{"text": t, **m} for t, m in zip(split_texts, metadatas)]
-    logger.info("Embedding and storing %d chunk(s) in Chroma...", len(docs_to_add))
-    vs.from_documents(docs_to_add)
+    vs = VectorStore(embedding_client=emb_client, persist_dir=persist_dir, collection_name=collection_name)
+    logger.info("Embedding and storing %d chunk(s) in Chroma...", len(split_texts))
+    vs.add_chunks(split_texts, store)
     vs.persist()
     logger.info("Index saved to %s. Done.", persist_dir or os.getenv("CHROMA_PERSIST_DIR", "./.chromadb"))
 
@@ -85,10 +92,11 @@ if __name__ == "__main__":
     p = argparse.ArgumentParser()
     p.add_argument("source_dir", help="Directory to index")
     p.add_argument("--persist_dir", default=None)
+    p.add_argument("--collection", default="default", help="Chroma collection to (re)build")
     p.add_argument("-v", "--verbose", action="store_true", help="Show debug logs (e.g. per-file names)")
     args = p.parse_args()
     if args.verbose:
         # Root logger must be DEBUG too, else propagated debug messages are filtered at the root.
         logging.getLogger().setLevel(logging.DEBUG)
         logging.getLogger(__name__).setLevel(logging.DEBUG)
-    index_directory(args.source_dir, persist_dir=args.persist_dir)
+    index_directory(args.source_dir, persist_dir=args.persist_dir, collection_name=args.collection)
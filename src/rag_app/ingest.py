@@ -44,7 +44,7 @@ def _read_html(path: Path) -> str:
 
 
 def load_file(path: str) -> Dict:
-    """Load a single file and return a document dict with 'text' and 'source'."""
+    """Load a single file and return a document dict with 'text', 'source' and 'modified' (mtime)."""
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(path)
@@ -63,7 +63,7 @@ def load_file(path: str) -> Dict:
             text = p.read_text(encoding="utf-8")
         except Exception:
             text = p.read_text(errors="ignore")
-    return {"text": text, "source": str(p)}
+    return {"text": text, "source": str(p), "modified": p.stat().st_mtime}
 
 
 def load_documents(path_or_dir: str, recursive: bool = True) -> List[Dict]:
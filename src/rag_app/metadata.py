@@ -0,0 +1,229 @@
+"""
+Columnar, dictionary-encoded chunk metadata with source-level pre-filtering.
+
+Instead of a dict per chunk, sources are interned once and each chunk is a
+(source id, chunk index) pair stored in integer arrays. Per-source attributes
+(file type, modification time) live in their own columns, so a filter is
+evaluated once per source into a per-source bitmap; the matching source ids
+are what the vector store pre-filters on.
+
+Filter expressions are plain dicts; every key is optional and all given keys
+must match:
+
+  source           path or glob (e.g. "/data/docs/*.md"), or a list of them
+  file_type        extension with or without the dot (e.g. "pdf"), or a list
+  modified_after   epoch seconds or ISO date/datetime (inclusive)
+  modified_before  epoch seconds or ISO date/datetime (exclusive)
+"""
+import json
+import math
+import os
+import uuid
+from array import array
+from datetime import datetime
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+FILTER_KEYS = ("source", "file_type", "modified_after", "modified_before")
+
+_GLOB_CHARS = set("*?[")
+
+
+def metadata_path(persist_directory: str, collection_name: str = "default") -> Path:
+    """Return the sidecar file holding the metadata store for a collection."""
+    return Path(persist_directory) / f"metadata_{collection_name}.json"
+
+
+def _as_list(value: Union[str, Iterable[str]]) -> List[str]:
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    return [str(v) for v in value]
+
+
+def _as_timestamp(value: Union[str, int, float]) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.strip()).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid date {value!r}; use epoch seconds or ISO format (YYYY-MM-DD)")
+
+
+def _normalize_file_type(value: str) -> str:
+    value = value.strip().lower()
+    return value if not value or value.startswith(".") else "." + value
+
+
+class MissingMetadataError(ValueError):
+    """Raised when filtering a collection that has no metadata store (needs re-indexing)."""
+
+    def __init__(self, collection_name: str):
+        super().__init__(
+            f"Collection {collection_name!r} has no metadata index; re-run the indexer to use filters."
+        )
+        self.collection_name = collection_name
+
+
+def parse_filters(filters: Optional[Dict]) -> Optional[Dict]:
+    """Validate and normalize a filter expression. Returns None if it is empty.
+
+    Call once at the entry point (API/CLI); the store and vector store expect
+    the normalized dict. Raises ValueError for unknown keys or malformed values.
+    """
+    if not filters:
+        return None
+    unknown = set(filters) - set(FILTER_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown filter key(s): {', '.join(sorted(unknown))}. Use: {', '.join(FILTER_KEYS)}")
+    out: Dict = {}
+    if filters.get("source"):
+        out["source"] = _as_list(filters["source"])
+    if filters.get("file_type"):
+        out["file_type"] = [_normalize_file_type(t) for t in _as_list(filters["file_type"])]
+    for key in ("modified_after", "modified_before"):
+        if filters.get(key) not in (None, ""):
+            out[key] = _as_timestamp(filters[key])
+    return out or None
+
+
+class MetadataStore:
+    """Columnar metadata for the chunks of one collection.
+
+    Row ``i`` is the i-th chunk added. Its row id and source id are stored with
+    the vector in Chroma: the row id to rehydrate results, the source id to
+    pre-filter (filters are per source, so the where clause stays O(#sources)).
+    ``generation`` is unique per index run and stored with every vector too, so
+    vectors and metadata from different runs are never mixed.
+    """
+
+    def __init__(self):
+        self.generation = uuid.uuid4().hex
+        # per source (dictionary-encoded)
+        self.sources: List[str] = []
+        self._source_index: Dict[str, int] = {}
+        self.file_types: List[str] = []
+        self._file_type_index: Dict[str, int] = {}
+        self.source_file_type = array("I")
+        self.source_modified = array("d")
+        # per chunk
+        self.source_ids = array("I")
+        self.chunk_ids = array("I")
+
+    def __len__(self) -> int:
+        return len(self.source_ids)
+
+    def add_source(self, source: str, modified: Optional[float] = None) -> int:
+        """Intern a source path and return its id."""
+        source = source or ""
+        sid = self._source_index.get(source)
+        if sid is not None:
+            return sid
+        sid = len(self.sources)
+        self.sources.append(source)
+        self._source_index[source] = sid
+        file_type = Path(source).suffix.lower()
+        tid = self._file_type_index.get(file_type)
+        if tid is None:
+            tid = len(self.file_types)
+            self.file_types.append(file_type)
+            self._file_type_index[file_type] = tid
+        self.source_file_type.append(tid)
+        self.source_modified.append(float(modified) if modified is not None else math.nan)
+        return sid
+
+    def add_chunk(self, source_id: int, chunk: int) -> int:
+        """Append a chunk of an interned source and return its row id."""
+        self.source_ids.append(source_id)
+        self.chunk_ids.append(chunk)
+        return len(self.source_ids) - 1
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "MetadataStore":
+        """Build a store from per-chunk dicts with 'source', 'chunk' and optional 'modified'."""
+        store = cls()
+        for r in records:
+            sid = store.add_source(r.get("source", ""), modified=r.get("modified"))
+            store.add_chunk(sid, int(r.get("chunk", 0)))
+        return store
+
+    def row(self, row: int) -> Dict:
+        """Return the metadata dict for a row (source, chunk, and modified if known)."""
+        sid = self.source_ids[row]
+        meta = {"source": self.sources[sid], "chunk": self.chunk_ids[row]}
+        modified = self.source_modified[sid]
+        if not math.isnan(modified):
+            meta["modified"] = modified
+        return meta
+
+    def source_mask(self, filters: Dict) -> bytearray:
+        """Return a per-source bitmap (1 = source passes) for normalized filters."""
+        mask = bytearray(b"\x01") * len(self.sources)
+        if "source" in filters:
+            allowed = bytearray(len(self.sources))
+            for pattern in filters["source"]:
+                if _GLOB_CHARS & set(pattern):
+                    for sid, source in enumerate(self.sources):
+                        if fnmatchcase(source, pattern):
+                            allowed[sid] = 1
+                else:
+                    sid = self._source_index.get(pattern)
+                    if sid is not None:
+                        allowed[sid] = 1
+            mask = bytearray(a & b for a, b in zip(mask, allowed))
+        if "file_type" in filters:
+            wanted = {self._file_type_index[t] for t in filters["file_type"] if t in self._file_type_index}
+            mask = bytearray(m & (t in wanted) for m, t in zip(mask, self.source_file_type))
+        after = filters.get("modified_after")
+        before = filters.get("modified_before")
+        if after is not None or before is not None:
+            lo = -math.inf if after is None else after
+            hi = math.inf if before is None else before
+            # NaN (unknown mtime) compares False, so undated sources are excluded
+            mask = bytearray(m & (lo <= t < hi) for m, t in zip(mask, self.source_modified))
+        return mask
+
+    def matching_sources(self, filters: Optional[Dict]) -> Optional[List[int]]:
+        """Return the source ids passing normalized filters, or None if every source passes."""
+        if filters is None:
+            return None
+        mask = self.source_mask(filters)
+        if mask.count(1) == len(mask):
+            return None
+        return [i for i, b in enumerate(mask) if b]
+
+    def save(self, path: Union[str, Path]) -> None:
+        data = {
+            "generation": self.generation,
+            "sources": self.sources,
+            "file_types": self.file_types,
+            "source_file_type": self.source_file_type.tolist(),
+            "source_modified": [None if math.isnan(t) else t for t in self.source_modified],
+            "source_ids": self.source_ids.tolist(),
+            "chunk_ids": self.chunk_ids.tolist(),
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers never see a half-written or stale-mixed file
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "MetadataStore":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        store = cls()
+        store.generation = data["generation"]
+        store.sources = data["sources"]
+        store._source_index = {s: i for i, s in enumerate(store.sources)}
+        store.file_types = data["file_types"]
+        store._file_type_index = {t: i for i, t in enumerate(store.file_types)}
+        store.source_file_type = array("I", data["source_file_type"])
+        store.source_modified = array("d", (math.nan if t is None else t for t in data["source_modified"]))
+        store.source_ids = array("I", data["source_ids"])
+        store.chunk_ids = array("I", data["chunk_ids"])
+        return store
@@ -6,11 +6,25 @@ Embedding and LLM provider factory. Configure via environment:
 
 OpenAI requires OPENAI_API_KEY. HuggingFace runs locally (no key). Ollama requires
 a local Ollama server (ollama run nomic-embed-text for embeddings, ollama run llama2 for LLM).
+
+Deterministic (temperature=0) LLMs share a persistent generation cache; see rag_app.cache.
 """
-from typing import Optional
+from typing import Any, Optional, Sequence
+import json
+import logging
 import os
+from langchain_core.caches import BaseCache
 from langchain_core.embeddings import Embeddings
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+from .cache import GenerationCache, cache_enabled
+
+logger = logging.getLogger(__name__)
+
+_llm_cache: Optional["LLMGenerationCache"] = None
+_llm_cache_failed = False  # set once setup fails so it is not retried on every get_llm
 
 
 def _has_openai_key() -> bool:
@@ -52,23 +66,88 @@ def get_embedding_client() -> Embeddings:
     )
 
 
+class LLMGenerationCache(BaseCache):
+    """LangChain cache adapter over the on-disk GenerationCache.
+
+    LangChain passes the rendered prompt and the model's identity string
+    (class, model name, temperature, ...) which together form the key. Only the
+    generated content is stored (plain JSON) and generations are rebuilt on
+    lookup, so nothing is deserialized through langchain_core.load.
+    """
+
+    def __init__(self, store: GenerationCache):
+        self.store = store
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        value = self.store.get(prompt, llm_string)
+        if value is None:
+            return None
+        try:
+            return [
+                ChatGeneration(message=AIMessage(content=g["content"]), generation_info=g.get("info"))
+                if g.get("chat")
+                else Generation(text=g["content"], generation_info=g.get("info"))
+                for g in json.loads(value)
+            ]
+        except Exception as e:
+            logger.warning("Ignoring unreadable LLM cache entry: %s", e)
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        entries = []
+        for g in return_val:
+            if isinstance(g, ChatGeneration):
+                entries.append({"chat": True, "content": g.message.content, "info": g.generation_info})
+            else:
+                entries.append({"chat": False, "content": g.text, "info": g.generation_info})
+        try:
+            value = json.dumps(entries)
+        except (TypeError, ValueError) as e:
+            logger.warning("Not caching LLM generation: %s", e)
+            return
+        self.store.put(prompt, llm_string, value)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+
+def get_llm_cache() -> Optional[LLMGenerationCache]:
+    """Return the process-wide LLM generation cache, or None if disabled/unavailable."""
+    global _llm_cache, _llm_cache_failed
+    if not cache_enabled() or _llm_cache_failed:
+        return None
+    if _llm_cache is None:
+        try:
+            _llm_cache = LLMGenerationCache(GenerationCache())
+        except Exception as e:
+            _llm_cache_failed = True
+            logger.warning("LLM generation cache unavailable: %s", e)
+    return _llm_cache
+
+
 def get_llm(
     model_name: Optional[str] = None,
     temperature: float = 0.0,
 ) -> BaseChatModel:
-    """Return a chat LLM based on LLM_PROVIDER."""
+    """Return a chat LLM based on LLM_PROVIDER.
+
+    Generations are cached on disk when temperature is 0 (output is deterministic).
+    """
     provider = get_llm_provider()
+    cache = get_llm_cache() if temperature == 0 else None
     if provider == "openai":
         from langchain_openai import ChatOpenAI
         return ChatOpenAI(
             model=model_name or os.getenv("OPENAI_LLM_MODEL", "gpt-3.5-turbo"),
             temperature=temperature,
+            cache=cache,
         )
     if provider == "ollama":
         from langchain_ollama import ChatOllama
         return ChatOllama(
             model=model_name or os.getenv("OLLAMA_LLM_MODEL", "tinyllama"),
             temperature=temperature,
+            cache=cache,
         )
     raise ValueError(
         f"Unknown LLM_PROVIDER={provider}. Use one of: openai, ollama"
@@ -1,9 +1,13 @@
 import logging
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 import os
 from langchain_chroma import Chroma
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+
+from .metadata import MetadataStore, MissingMetadataError, metadata_path
 
 # ChromaDB rejects upserts larger than its internal max (~5461). Use a safe batch size.
 CHROMA_UPSERT_BATCH_SIZE = 4000
@@ -11,48 +15,109 @@ CHROMA_UPSERT_BATCH_SIZE = 4000
 logger = logging.getLogger(__name__)
 
 
-def _clear_collection_if_exists(persist_directory: str, collection_name: str = "default") -> None:
-    """Delete the Chroma collection so the next index run replaces it (no duplicates)."""
-    try:
-        import chromadb
-        client = chromadb.PersistentClient(path=persist_directory)
-        names = [c.name for c in client.list_collections()]
-        if collection_name in names:
-            client.delete_collection(name=collection_name)
-            logger.info("Cleared existing collection %r for fresh index.", collection_name)
-    except Exception as e:
-        logger.warning("Could not clear collection %r: %s", collection_name, e)
+class MetadataRetriever(BaseRetriever):
+    """Retriever that applies metadata pre-filters and rehydrates chunk metadata."""
+
+    vectorstore: Any  # VectorStore
+    k: int = 4
+    filters: Optional[Dict] = None
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return self.vectorstore.search_documents(query, k=self.k, filters=self.filters)
 
 
 class VectorStore:
-    """Wrapper around Chroma vector store for persistence and retrieval."""
+    """Wrapper around Chroma vector store for persistence and retrieval.
 
-    def __init__(self, embedding_client: Optional[Embeddings] = None, persist_dir: Optional[str] = None):
+    Chunk metadata is kept in a columnar MetadataStore persisted next to the
+    Chroma DB; Chroma itself only stores each chunk's row id, source id and
+    index generation.
+    """
+
+    def __init__(
+        self,
+        embedding_client: Optional[Embeddings] = None,
+        persist_dir: Optional[str] = None,
+        collection_name: str = "default",
+    ):
         self.embedding_client = embedding_client
         persist_dir = persist_dir or os.getenv("CHROMA_PERSIST_DIR", "./.chromadb")
-        self._chroma = Chroma(persist_directory=persist_dir, embedding_function=embedding_client) if embedding_client else None
+        self.persist_dir = persist_dir
+        self.collection_name = collection_name
+        self._chroma = (
+            Chroma(collection_name=collection_name, persist_directory=persist_dir, embedding_function=embedding_client)
+            if embedding_client
+            else None
+        )
+        self._metadata: Optional[MetadataStore] = None
+        self._metadata_mtime: Optional[int] = None
+
+    def metadata_store(self) -> Optional[MetadataStore]:
+        """Return the collection's metadata store, reloading it when the sidecar changes on disk."""
+        path = metadata_path(self.persist_dir, self.collection_name)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._metadata_mtime:
+            self._metadata = MetadataStore.load(path) if mtime is not None else None
+            self._metadata_mtime = mtime
+        return self._metadata
+
+    def _save_metadata(self, store: MetadataStore) -> None:
+        path = metadata_path(self.persist_dir, self.collection_name)
+        store.save(path)
+        self._metadata = store
+        self._metadata_mtime = path.stat().st_mtime_ns
+
+    def add_chunks(self, texts: List[str], store: MetadataStore, extra_metadatas: Optional[List[Dict]] = None):
+        """Replace the collection with chunk texts row-aligned with `store` (row i = texts[i]).
 
-    def from_documents(self, docs: List[Dict], embeddings: Optional[List[List[float]]] = None, collection_name: str = "default"):
+        Rows are upserted under stable ids and leftover ids from a previous index
+        are deleted afterwards, so the collection is never dropped under running
+        readers. The metadata sidecar is written once the vectors are in place;
+        until then readers keep using the previous generation.
+        """
         if self._chroma is None:
             raise ValueError("VectorStore requires an embedding client to create Chroma store")
-        texts = [d["text"] for d in docs]
-        metadatas = [{k: v for k, v in d.items() if k != "text"} for d in docs]
+        if len(texts) != len(store):
+            raise ValueError(f"Got {len(texts)} texts for {len(store)} metadata rows")
         n_batches = (len(texts) + CHROMA_UPSERT_BATCH_SIZE - 1) // CHROMA_UPSERT_BATCH_SIZE
         for i in range(0, len(texts), CHROMA_UPSERT_BATCH_SIZE):
             batch_texts = texts[i : i + CHROMA_UPSERT_BATCH_SIZE]
-            batch_metadatas = metadatas[i : i + CHROMA_UPSERT_BATCH_SIZE]
+            rows = range(i, i + len(batch_texts))
+            batch_metadatas = [{"row": r, "sid": store.source_ids[r], "gen": store.generation} for r in rows]
+            if extra_metadatas is not None:
+                batch_metadatas = [{**extra_metadatas[r], **m} for r, m in zip(rows, batch_metadatas)]
             batch_num = i // CHROMA_UPSERT_BATCH_SIZE + 1
             if n_batches > 1:
                 logger.info("Storing batch %d/%d (%d chunks)", batch_num, n_batches, len(batch_texts))
-            self._chroma.add_texts(texts=batch_texts, metadatas=batch_metadatas, collection_name=collection_name)
+            self._chroma.add_texts(texts=batch_texts, metadatas=batch_metadatas, ids=[str(r) for r in rows])
+
+        keep = {str(r) for r in range(len(texts))}
+        stale = [i for i in self._chroma.get(include=[])["ids"] if i not in keep]
+        for i in range(0, len(stale), CHROMA_UPSERT_BATCH_SIZE):
+            self._chroma.delete(ids=stale[i : i + CHROMA_UPSERT_BATCH_SIZE])
+        if stale:
+            logger.info("Removed %d chunk(s) left over from the previous index.", len(stale))
+        self._save_metadata(store)
 
-    def get_retriever(self, collection_name: str = "default", k: int = 4):
+    def from_documents(self, docs: List[Dict], embeddings: Optional[List[List[float]]] = None):
+        """Store document dicts ('text', 'source', 'chunk', optional 'modified').
+
+        Any other keys are kept in Chroma alongside the row id.
+        """
+        texts = [d["text"] for d in docs]
+        store = MetadataStore.from_records(docs)
+        columnar = {"text", "source", "chunk", "modified"}
+        extras = [{k: v for k, v in d.items() if k not in columnar} for d in docs]
+        self.add_chunks(texts, store, extra_metadatas=extras if any(extras) else None)
+
+    def get_retriever(self, k: int = 4, filters: Optional[Dict] = None):
         """Return a LangChain retriever configured for the collection."""
         if self._chroma is None:
             raise ValueError("VectorStore requires an embedding client to query")
-        # Chroma supports as_retriever which returns a Retriever object compatible
-        # with LangChain chains.
-        return self._chroma.as_retriever(search_kwargs={"k": k})
+        return MetadataRetriever(vectorstore=self, k=k, filters=filters)
 
     def persist(self):
         """Persist the Chroma collection to disk (if available)."""
@@ -64,14 +129,47 @@ class VectorStore:
             # Chroma may persist automatically depending on the configuration
             pass
 
-    def similarity_search(self, query: str, k: int = 4, collection_name: str = "default") -> List[Dict]:
+    def search_documents(self, query: str, k: int = 4, filters: Optional[Dict] = None) -> List[Document]:
+        """Similarity search returning Documents with their full metadata.
+
+        `filters` must already be normalized by rag_app.metadata.parse_filters.
+        They are resolved to matching source ids and passed to Chroma as a
+        pre-filter, so only chunks of those sources are scored. Only vectors of
+        the metadata store's generation are searched.
+        """
         if self._chroma is None:
             raise ValueError("VectorStore requires an embedding client to query")
-        docs = self._chroma.similarity_search(query, k=k, collection_name=collection_name)
+        store = self.metadata_store()
+        if store is None:
+            if filters is not None:
+                raise MissingMetadataError(self.collection_name)
+            return self._chroma.similarity_search(query, k=k)
+        clauses = [{"gen": store.generation}]
+        sids = store.matching_sources(filters)
+        if sids is not None:
+            if not sids:
+                return []
+            clauses.append({"sid": {"$in": sids}} if len(sids) > 1 else {"sid": sids[0]})
+        where = clauses[0] if len(clauses) == 1 else {"$and": clauses}
+        docs = self._chroma.similarity_search(query, k=k, filter=where)
+        results = []
+        for d in docs:
+            row = d.metadata.pop("row", None)
+            d.metadata.pop("sid", None)
+            gen = d.metadata.pop("gen", None)
+            if row is None or gen != store.generation:
+                # Written by an index run that does not match the loaded metadata
+                logger.warning("Skipping chunk from another index generation (row %s)", row)
+                continue
+            d.metadata.update(store.row(int(row)))
+            results.append(d)
+        return results
+
+    def similarity_search(self, query: str, k: int = 4, filters: Optional[Dict] = None) -> List[Dict]:
+        docs = self.search_documents(query, k=k, filters=filters)
         # Convert LangChain Document objects to plain dicts
         results = []
         for d in docs:
             meta = d.metadata if hasattr(d, "metadata") else {}
             results.append({"text": d.page_content if hasattr(d, "page_content") else str(d), **meta})
         return results
-
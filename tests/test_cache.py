@@ -0,0 +1,61 @@
+from rag_app.cache import GenerationCache
+
+
+def test_roundtrip_keyed_on_prompt_and_model(tmp_path):
+    cache = GenerationCache(tmp_path / "gen.sqlite3", max_bytes=1024)
+    cache.put("prompt", "model-a", "answer")
+    assert cache.get("prompt", "model-a") == "answer"
+    assert cache.get("prompt", "model-b") is None
+    assert cache.get("other prompt", "model-a") is None
+
+
+def test_shared_across_instances(tmp_path):
+    path = tmp_path / "gen.sqlite3"
+    GenerationCache(path, max_bytes=1024).put("p", "m", "v")
+    assert GenerationCache(path, max_bytes=1024).get("p", "m") == "v"
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = GenerationCache(tmp_path / "gen.sqlite3", max_bytes=25, touch_interval=0)
+    cache.put("a", "m", "x" * 10)
+    cache.put("b", "m", "y" * 10)
+    assert cache.get("a", "m") is not None  # touch a so b is the LRU entry
+    cache.put("c", "m", "z" * 10)
+    assert len(cache) == 2
+    assert cache.get("b", "m") is None
+    assert cache.get("a", "m") == "x" * 10
+    cache.put("huge", "m", "w" * 100)
+    assert cache.get("huge", "m") is None
+
+
+def test_running_total_tracks_replace_and_evict(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "gen.sqlite3"
+    cache = GenerationCache(path, max_bytes=20)
+    cache.put("a", "m", "x" * 10)
+    cache.put("a", "m", "x" * 5)
+    cache.put("b", "m", "y" * 10)
+    cache.put("c", "m", "z" * 10)
+    conn = sqlite3.connect(str(path))
+    try:
+        total = conn.execute("SELECT total FROM cache_meta").fetchone()[0]
+        assert total == conn.execute("SELECT SUM(size) FROM generations").fetchone()[0] == 20
+        assert conn.execute("SELECT COUNT(*) FROM generations").fetchone()[0] == 2  # "a" evicted
+    finally:
+        conn.close()
+
+
+def test_hits_touch_accessed_at_most_once_per_interval(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "gen.sqlite3"
+    cache = GenerationCache(path, max_bytes=1024, touch_interval=3600)
+    cache.put("p", "m", "v")
+    conn = sqlite3.connect(str(path))
+    try:
+        before = conn.execute("SELECT accessed FROM generations").fetchone()[0]
+        assert cache.get("p", "m") == "v"
+        assert conn.execute("SELECT accessed FROM generations").fetchone()[0] == before
+    finally:
+        conn.close()
@@ -0,0 +1,57 @@
+import pytest
+
+from rag_app.metadata import MetadataStore, parse_filters
+
+
+def _store():
+    store = MetadataStore()
+    a = store.add_source("/docs/a.pdf", modified=1_700_000_000)
+    b = store.add_source("/docs/notes/b.md", modified=1_600_000_000)
+    for i in range(3):
+        store.add_chunk(a, i)
+    store.add_chunk(b, 0)
+    return store
+
+
+def test_sources_interned_once():
+    store = _store()
+    assert store.add_source("/docs/a.pdf") == 0
+    assert store.sources == ["/docs/a.pdf", "/docs/notes/b.md"]
+    assert len(store) == 4
+    assert store.row(3) == {"source": "/docs/notes/b.md", "chunk": 0, "modified": 1_600_000_000}
+
+
+def _sources(store, filters):
+    return store.matching_sources(parse_filters(filters))
+
+
+def test_filters_match_sources():
+    store = _store()
+    assert _sources(store, None) is None
+    assert _sources(store, {"file_type": "md"}) == [1]
+    assert _sources(store, {"source": "/docs/a.pdf"}) == [0]
+    assert _sources(store, {"source": "/docs/notes/*"}) == [1]
+    assert _sources(store, {"modified_after": "2023-01-01", "file_type": ".pdf"}) == [0]
+    assert _sources(store, {"file_type": "docx"}) == []
+    assert _sources(store, {"file_type": "pdf,md"}) is None
+    assert store.source_mask(parse_filters({"modified_before": 1_650_000_000})) == bytearray([0, 1])
+
+
+def test_parse_filters_rejects_unknown_keys():
+    assert parse_filters({"source": None, "file_type": ""}) is None
+    with pytest.raises(ValueError):
+        parse_filters({"author": "me"})
+    with pytest.raises(ValueError):
+        parse_filters({"modified_after": "yesterday"})
+
+
+def test_save_load_roundtrip(tmp_path):
+    store = _store()
+    store.add_chunk(store.add_source("/docs/c.txt"), 0)
+    path = tmp_path / "metadata_default.json"
+    store.save(path)
+    loaded = MetadataStore.load(path)
+    assert [loaded.row(i) for i in range(len(loaded))] == [store.row(i) for i in range(len(store))]
+    assert loaded.generation == store.generation
+    assert _sources(loaded, {"source": "/docs/c.txt"}) == [2]
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from rag_app import providers
+from rag_app.cache import GenerationCache
+from rag_app.providers import LLMGenerationCache
+
+
+class CountingFakeChatModel(FakeListChatModel):
+    calls: int = 0
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+        return super()._call(*args, **kwargs)
+
+
+def test_adapter_skips_model_on_repeated_prompt(tmp_path):
+    cache = LLMGenerationCache(GenerationCache(tmp_path / "gen.sqlite3"))
+    llm = CountingFakeChatModel(responses=["first", "second"], cache=cache)
+    assert llm.invoke("same prompt").content == "first"
+    assert llm.invoke("same prompt").content == "first"
+    assert llm.calls == 1
+    assert llm.invoke("other prompt").content == "second"
+    assert llm.calls == 2
+
+    # Another instance of the same model sharing the file (e.g. another worker) still hits
+    other = CountingFakeChatModel(responses=["first", "second"], cache=LLMGenerationCache(GenerationCache(tmp_path / "gen.sqlite3")))
+    assert other.invoke("same prompt").content == "first"
+    assert other.calls == 0
+
+
+def test_get_llm_caches_only_deterministic_runs(tmp_path, monkeypatch):
+    pytest.importorskip("langchain_ollama")
+    monkeypatch.setenv("LLM_PROVIDER", "ollama")
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "gen.sqlite3"))
+    monkeypatch.setattr(providers, "_llm_cache", None)
+    monkeypatch.setattr(providers, "_llm_cache_failed", False)
+
+    assert isinstance(providers.get_llm(temperature=0.0).cache, LLMGenerationCache)
+    assert providers.get_llm(temperature=0.7).cache is None
+
+    monkeypatch.setenv("LLM_CACHE", "0")
+    assert providers.get_llm(temperature=0.0).cache is None
+
+
+def test_cache_setup_failure_is_not_retried(monkeypatch):
+    calls = []
+
+    def broken_cache():
+        calls.append(1)
+        raise OSError("read-only file system")
+
+    monkeypatch.delenv("LLM_CACHE", raising=False)
+    monkeypatch.setattr(providers, "_llm_cache", None)
+    monkeypatch.setattr(providers, "_llm_cache_failed", False)
+    monkeypatch.setattr(providers, "GenerationCache", broken_cache)
+    assert providers.get_llm_cache() is None
+    assert providers.get_llm_cache() is None
+    assert len(calls) == 1
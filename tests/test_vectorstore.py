@@ -0,0 +1,120 @@
+import pytest
+
+pytest.importorskip("langchain_chroma")
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from rag_app.metadata import MetadataStore, MissingMetadataError, parse_filters
+from rag_app.vectorstore import VectorStore
+
+
+class StubChroma:
+    """Records calls and returns canned documents in place of Chroma."""
+
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+        self.filters = []
+        self.added = {}
+
+    def similarity_search(self, query, k=4, filter=None):
+        self.filters.append(filter)
+        return [Document(page_content=d.page_content, metadata=dict(d.metadata)) for d in self.docs[:k]]
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs):
+        self.added.update((i, (t, m)) for i, t, m in zip(ids, texts, metadatas))
+
+    def get(self, include=None):
+        return {"ids": list(self.added)}
+
+    def delete(self, ids=None):
+        for i in ids:
+            del self.added[i]
+
+
+def _vectorstore(tmp_path, chroma):
+    vs = VectorStore(persist_dir=str(tmp_path))
+    vs._chroma = chroma
+    return vs
+
+
+def _store():
+    store = MetadataStore()
+    a = store.add_source("/docs/a.pdf", modified=1_700_000_000)
+    b = store.add_source("/docs/b.md")
+    store.add_chunk(a, 0)
+    store.add_chunk(a, 1)
+    store.add_chunk(b, 0)
+    return store
+
+
+def test_add_chunks_replaces_rows_in_place(tmp_path):
+    chroma = StubChroma()
+    vs = _vectorstore(tmp_path, chroma)
+    vs.add_chunks(["x", "y", "z"], _store())
+    store = MetadataStore()
+    store.add_chunk(store.add_source("/docs/c.txt"), 0)
+    vs.add_chunks(["w"], store)
+    assert chroma.added == {"0": ("w", {"row": 0, "sid": 0, "gen": store.generation})}
+    # the sidecar is written by add_chunks itself
+    assert VectorStore(persist_dir=str(tmp_path)).metadata_store().generation == store.generation
+
+
+def test_search_prefilters_by_source_and_rehydrates(tmp_path):
+    store = _store()
+    chroma = StubChroma([Document(page_content="z", metadata={"row": 2, "sid": 1, "gen": store.generation})])
+    vs = _vectorstore(tmp_path, chroma)
+    vs.add_chunks(["x", "y", "z"], store)
+    gen = {"gen": store.generation}
+
+    docs = vs.search_documents("q", filters=parse_filters({"file_type": "md"}))
+    assert chroma.filters[-1] == {"$and": [gen, {"sid": 1}]}
+    assert docs[0].metadata == {"source": "/docs/b.md", "chunk": 0}
+
+    vs.search_documents("q", filters=parse_filters({"file_type": "pdf,md"}))
+    assert chroma.filters[-1] == gen
+    vs.search_documents("q")
+    assert chroma.filters[-1] == gen
+
+    assert vs.search_documents("q", filters=parse_filters({"file_type": "docx"})) == []
+
+
+def test_search_skips_other_generations(tmp_path):
+    store = _store()
+    chroma = StubChroma([
+        Document(page_content="old", metadata={"row": 0, "sid": 0, "gen": "previous"}),
+        Document(page_content="x", metadata={"row": 0, "sid": 0, "gen": store.generation}),
+    ])
+    vs = _vectorstore(tmp_path, chroma)
+    vs.add_chunks(["x", "y", "z"], store)
+    results = vs.similarity_search("q")
+    assert [r["text"] for r in results] == ["x"]
+    assert results[0]["modified"] == 1_700_000_000
+
+
+def test_filters_without_metadata_index(tmp_path):
+    vs = _vectorstore(tmp_path, StubChroma())
+    with pytest.raises(MissingMetadataError, match="re-run the indexer"):
+        vs.search_documents("q", filters=parse_filters({"file_type": "md"}))
+
+
+def test_reindex_under_open_reader(tmp_path):
+    emb = DeterministicFakeEmbedding(size=16)
+    reader = VectorStore(embedding_client=emb, persist_dir=str(tmp_path), collection_name="docs")
+    assert reader.metadata_store() is None
+
+    writer = VectorStore(embedding_client=emb, persist_dir=str(tmp_path), collection_name="docs")
+    writer.from_documents([
+        {"text": f"old chunk {i}", "source": f"/docs/old{i}.md", "chunk": 0} for i in range(5)
+    ])
+    assert {r["source"] for r in reader.similarity_search("chunk", k=10)} == {f"/docs/old{i}.md" for i in range(5)}
+
+    # Re-index with fewer chunks from another store; the open reader keeps working
+    writer = VectorStore(embedding_client=emb, persist_dir=str(tmp_path), collection_name="docs")
+    writer.from_documents([
+        {"text": "new chunk a", "source": "/docs/new.txt", "chunk": 0},
+        {"text": "new chunk b", "source": "/docs/new.txt", "chunk": 1},
+    ])
+    results = reader.similarity_search("chunk", k=10, filters=parse_filters({"file_type": "txt"}))
+    assert sorted((r["source"], r["chunk"]) for r in results) == [("/docs/new.txt", 0), ("/docs/new.txt", 1)]
+    assert len(reader.similarity_search("chunk", k=10)) == 2